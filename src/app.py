@@ -11,21 +11,46 @@ endpoints for:
 * handling webhook notifications for downstream business logic integration.
 """
 
-from os import environ
+import asyncio
+import random
+import time
+from os import cpu_count, environ
 from pathlib import Path
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache
 
-from json import dumps, loads
+import orjson
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, JSONResponse, Response
+from fastapi.staticfiles import StaticFiles
 
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import httpx
+import msgspec
+import uvicorn
 import braintree
 
+_HTML_DIR = Path(__file__).resolve().parent.parent / "html"
+_MAX_OUTBOUND_REQUESTS = 64
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Reservations are not idempotent: a 500/502/504 may arrive after PBS already
+# reserved, so only retry responses that guarantee nothing was processed.
+_RESERVE_RETRY_STATUSES = frozenset({429, 503})
+_RETRY_ATTEMPTS = 3
+_RETRY_BASE_DELAY = 0.5
+_RETRY_MAX_DELAY = 8.0
+# PBS does not document whether initializeClient tokens are tied to a session,
+# so a token is shared between visitors only briefly to absorb bursts.
+_CLIENT_TOKEN_TTL = 60
+_ALLOWED_PAYMENT_METHODS = frozenset(
+    {"creditcard", "applepay", "googlepay", "paypal"})
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -38,6 +63,13 @@ class Settings(BaseSettings):
     bt_webhook_private_key: str | None = None
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load the environment and parse settings once per process."""
+    load_dotenv()
+    return Settings()
+
+
 def _bt_environment(value: str) -> braintree.Environment:
     """Return the Braintree environment for the given setting value."""
     v = value.lower()
@@ -63,17 +95,39 @@ def create_gateway(config: Settings) -> braintree.BraintreeGateway:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize and release application resources for FastAPI lifespan."""
-    load_dotenv()
-    settings = Settings()
+    settings = get_settings()
     app.state.settings = settings
     app.state.gateway = create_gateway(settings)
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=64, keepalive_expiry=60),
+    )
+    app.state.mps_token = None
+    app.state.mps_refresh = None
+    app.state.client_tokens = {}
+    app.state.client_token_refresh = {}
+    app.state.outbound_limit = asyncio.Semaphore(_MAX_OUTBOUND_REQUESTS)
     try:
         yield
     finally:
+        await app.state.http.aclose()
+        app.state.http = None
         app.state.gateway = None
 
 
-app = FastAPI(title="ETC Payments (Braintree)", lifespan=lifespan)
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+app = FastAPI(
+    title="ETC Payments (Braintree)",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -85,10 +139,55 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-
-
-def get_mps_token() -> str:
-    """Fetch and return the OAuth access token for MPS API calls."""
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Return how long to wait before retrying, honouring `Retry-After`."""
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return min(_RETRY_MAX_DELAY, float(retry_after))
+    backoff = min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2 ** attempt)
+    return backoff + random.uniform(0, _RETRY_BASE_DELAY)
+
+
+async def _post_with_retry(
+    request: Request,
+    url: str,
+    retry_statuses: frozenset[int] = _RETRY_STATUSES,
+    **kwargs,
+) -> httpx.Response:
+    """POST via the shared client, backing off on `retry_statuses` responses.
+
+    The number of in-flight outbound requests is capped by a semaphore; it is
+    released while sleeping so waiting retries do not hold a slot.
+    """
+    http = get_http(request)
+    limit = request.app.state.outbound_limit
+    for attempt in range(_RETRY_ATTEMPTS):
+        async with limit:
+            response = await http.post(url, **kwargs)
+        if response.status_code not in retry_statuses or attempt == _RETRY_ATTEMPTS - 1:
+            return response
+        delay = _retry_delay(response, attempt)
+        print(f"{url} returned {response.status_code}, retrying in {delay:.1f}s...")
+        await asyncio.sleep(delay)
+    return response
+
+
+@dataclass
+class CachedToken:
+    """An access token together with the monotonic time it expires at."""
+    token: str
+    expires_at: float
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+async def fetch_mps_token(request: Request) -> CachedToken:
+    """Fetch a fresh OAuth access token for MPS API calls."""
 
     req_url = "https://global.telekom.com/gcp-web-api/oauth"
 
@@ -101,60 +200,121 @@ def get_mps_token() -> str:
 
     payload = "grant_type=client_credentials&scope=T00X7T70"
 
-    with httpx.Client(timeout=10.0) as client:
-        data = client.post(req_url, data=payload, headers=headers_list)
-    return loads(data.text)["access_token"]
+    data = await _post_with_retry(
+        request, req_url, data=payload, headers=headers_list)
+    data.raise_for_status()
+    body = data.json()
+    # Refresh a little early so a token never expires while in flight.
+    return CachedToken(
+        token=body["access_token"],
+        expires_at=time.monotonic() + int(body["expires_in"]) - 30,
+    )
 
 
-MPS_TOKEN = ""
+async def get_mps_token(request: Request, stale: str | None = None) -> str:
+    """Return a valid MPS access token, refreshing the cached one if needed.
+
+    Pass the token that was just rejected as `stale` to force a refresh.
+    Concurrent callers share a single in-flight refresh, so a burst of
+    requests after expiry costs one OAuth round-trip.
+    """
+    state = request.app.state
+    cached = state.mps_token
+    if cached and not cached.expired and cached.token != stale:
+        return cached.token
+    if state.mps_refresh is None:
+        print("Refreshing MPS token...")
+        state.mps_refresh = asyncio.ensure_future(_refresh_mps_token(request))
+    # Shielded so a cancelled caller does not abort the refresh for the rest.
+    cached = await asyncio.shield(state.mps_refresh)
+    return cached.token
+
+
+async def _refresh_mps_token(request: Request) -> CachedToken:
+    """Fetch and store a new MPS token, then clear the in-flight marker."""
+    state = request.app.state
+    try:
+        state.mps_token = await fetch_mps_token(request)
+        return state.mps_token
+    finally:
+        state.mps_refresh = None
 
 
-def initialize_braintree(method: str) -> str:
+async def initialize_braintree(request: Request, method: str) -> str:
     """Request a client token for the provided payment method type."""
-    global MPS_TOKEN
     req_url = "https://pbs.acceptance.p5x.telekom-dienste.de/pbs-mapi-adapter/braintree/initializeClient"
 
-    headers_dict = {
-        "Accept": "*/*",
-        "Authorization": f"bearer {MPS_TOKEN}",
-        "Content-Type": "application/json"
-    }
-
     payload = {
         "businessPartnerConfigId": "474",
         "paymentMethodType": method
     }
 
-    def post_call():
-        with httpx.Client(timeout=10.0) as client:
-            response = client.post(
-                req_url, json=payload, headers=headers_dict)
-            response.raise_for_status()
-        if not response:
+    async def post_call(token: str) -> httpx.Response:
+        headers_dict = {
+            "Accept": "*/*",
+            "Authorization": f"bearer {token}",
+            "Content-Type": "application/json"
+        }
+        response = await _post_with_retry(
+            request, req_url, content=orjson.dumps(payload), headers=headers_dict)
+        response.raise_for_status()
+        if not response.content:
             raise RuntimeError(
                 "Received empty response from Braintree initializeClient endpoint"
             )
         return response
 
-    response = {}
-    while not response:
+    try:
+        token = await get_mps_token(request)
         try:
-            print("Refreshing MPS token...")
-            if not MPS_TOKEN:
-                MPS_TOKEN = get_mps_token()
-            response = post_call()
+            response = await post_call(token)
         except httpx.HTTPStatusError as exc:
-            if exc.response.status_code == 401:
-                MPS_TOKEN = ""
-                print("MPS token expired, refreshing...")
-            raise RuntimeError(
-                f"Failed to initialize Braintree (status {exc.response.status_code}): {exc.response.text}"
-            ) from exc
-        except httpx.RequestError as exc:
-            raise RuntimeError(
-                "Failed to reach Braintree initializeClient endpoint") from exc
-
-    return loads(response.text)["clientToken"]
+            if exc.response.status_code != 401:
+                raise
+            print("MPS token expired, refreshing...")
+            token = await get_mps_token(request, stale=token)
+            response = await post_call(token)
+    except httpx.HTTPStatusError as exc:
+        raise RuntimeError(
+            f"Failed to initialize Braintree (status {exc.response.status_code}): {exc.response.text}"
+        ) from exc
+    except httpx.RequestError as exc:
+        raise RuntimeError(
+            "Failed to reach Braintree initializeClient endpoint") from exc
+
+    return response.json()["clientToken"]
+
+
+async def get_client_token(request: Request, method: str) -> str:
+    """Return a client token for `method`, reusing a cached one until it ages out.
+
+    Each payment method has its own in-flight refresh, so a slow miss for one
+    method never delays requests for another.
+    """
+    state = request.app.state
+    cached = state.client_tokens.get(method)
+    if cached and not cached.expired:
+        return cached.token
+    refresh = state.client_token_refresh.get(method)
+    if refresh is None:
+        refresh = asyncio.ensure_future(_refresh_client_token(request, method))
+        state.client_token_refresh[method] = refresh
+    cached = await asyncio.shield(refresh)
+    return cached.token
+
+
+async def _refresh_client_token(request: Request, method: str) -> CachedToken:
+    """Fetch and store a new client token, then clear the in-flight marker."""
+    state = request.app.state
+    try:
+        cached = CachedToken(
+            token=await initialize_braintree(request, method),
+            expires_at=time.monotonic() + _CLIENT_TOKEN_TTL,
+        )
+        state.client_tokens[method] = cached
+        return cached
+    finally:
+        del state.client_token_refresh[method]
 
 
 def get_gateway(request: Request) -> braintree.BraintreeGateway:
@@ -162,6 +322,11 @@ def get_gateway(request: Request) -> braintree.BraintreeGateway:
     return request.app.state.gateway
 
 
+def get_http(request: Request) -> httpx.AsyncClient:
+    """Retrieve the shared outbound HTTP client from the FastAPI app state."""
+    return request.app.state.http
+
+
 # ---------- Schemas ----------
 class ClientTokenRequest(BaseModel):
     customer_id: str | None = None
@@ -173,234 +338,271 @@ class PaymentMethodCreateRequest(BaseModel):
     make_default: bool = True
 
 
-class TransactionReserveRequest(BaseModel):
+class TransactionReserveRequest(msgspec.Struct):
     amount: str
     payment_method_token: str | None = None
     payment_method_nonce: str | None = None
     order_id: str | None = None
 
 
+class ClientTokenResponse(BaseModel):
+    clientToken: str
+
+
+def msgspec_body(model: type[msgspec.Struct]):
+    """Build a dependency that decodes the JSON request body into `model`.
+
+    Errors are raised as `RequestValidationError` so clients keep receiving
+    FastAPI's usual `{"detail": [...]}` 422 body.
+    """
+    async def decode(request: Request):
+        try:
+            return msgspec.json.decode(await request.body(), type=model)
+        except msgspec.DecodeError as exc:
+            error_type = ("value_error" if isinstance(exc, msgspec.ValidationError)
+                          else "json_invalid")
+            raise RequestValidationError(
+                [{"type": error_type, "loc": ("body",), "msg": str(exc)}]) from exc
+    return decode
+
+
+def msgspec_openapi(model: type[msgspec.Struct]) -> dict:
+    """Describe `model` as the JSON request body for a route's OpenAPI entry."""
+    _, components = msgspec.json.schema_components(
+        [model], ref_template="#/components/schemas/{name}")
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": components[model.__name__]},
+            },
+        },
+    }
+
+
+# Static parts of the PBS checkout payloads, shared by the reserve endpoints.
+_PBS_RESERVE_BASE = {
+    "businessPartnerConfigId": "474",
+    "currency": "EUR",
+    "locale": "de_DE",
+    "description": "Ihr Multibrand Zahlungsmandat",
+    "returnUrl": "http://www.telekom.de",
+    "settlementData": {"settlementConfigurationId": "5988"},
+}
+
+_PBS_LINE_ITEM_BASE = {
+    "name": "Zahlung + Speicherung des Zahlungsmandats",
+    "taxRate": 19,
+    "quantity": 1,
+    "uiDetails": {},
+}
+
+
 @app.get("/")
 def get_index():
-    body = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <title>Index</title>
-</head>
-<body>
-    <ul>
-        <li><a href="/html/recurring_payment_reserve_creditcard.html">Recurring Payment Reserve Credit Card</a></li>
-        <li><a href="/html/recurring_payment_reserve_googlepay.html">Recurring Payment Reserve Google Pay</a></li>
-        <li><a href="/html/recurring_payment_reserve_paypal.html">Recurring Payment Reserve PayPal</a></li>
-        <li><a href="/html/onetime_payment_reserve_creditcard.html">One Time Payment Reserve Credit Card</a></li>
-    </ul>
-    if you want me to fix one of <a href="/untested.html">these</a>, please contact me.
-</body>
-</html>
-"""
-    return HTMLResponse(content=body)
+    return FileResponse(_HTML_DIR / "index.html")
 
 
 @app.get("/untested.html")
 def get_untested():
-    body = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <title>Index</title>
-</head>
-<body>
-    The following endpoints are untested:
-    <ul>
-        <li><a href="/html/reserve_paypal.html">One Time Reserve PayPal</a></li>
-        <li><a href="/html/reserve.html">reserve ?</a></li>
-        <li><a href="/html/reserve_recurring.html">???</a></li>
-        <li><a href="/html/webclient.html">Webclient</a></li>
-    </ul>
-</body>
-</html>
-"""
-    return HTMLResponse(content=body)
+    return FileResponse(_HTML_DIR / "untested.html")
 
 
-@app.get("/html/{filename}", response_class=HTMLResponse)
-def get_html_file(filename: str):
-    """Serve an HTML file from the local html directory if it is safe."""
-    html_root = Path("html").resolve()
-    candidate = (html_root / filename).resolve()
-    if html_root not in candidate.parents or candidate.suffix != ".html":
-        raise HTTPException(status_code=400, detail="Invalid path segment")
-    try:
-        content = candidate.read_text(encoding="utf-8")
-    except FileNotFoundError as exc:
-        raise HTTPException(status_code=404, detail="File not found") from exc
-    return HTMLResponse(content=content, headers={"Cache-Control": "no-cache"})
-
-
-@app.post("/client-token/{payment_method}")
-def create_client_token(payment_method: str) -> dict:
+@app.post("/client-token/{payment_method}", response_model=ClientTokenResponse)
+async def create_client_token(
+    payment_method: str,
+    request: Request,
+) -> ORJSONResponse:
     """Generate a client token for the specified payment method."""
-    if payment_method not in ["creditcard", "applepay", "googlepay", "paypal"]:
+    if payment_method not in _ALLOWED_PAYMENT_METHODS:
         raise HTTPException(
             status_code=400,
             detail="Unsupported payment method type",
         )
-    token = initialize_braintree(payment_method)
+    token = await get_client_token(request, payment_method)
     print(f"\nToken: {token}\n")
-    return {"clientToken": token}
+    # The token comes straight from the PBS adapter; response_model only
+    # documents the shape, returning a Response skips FastAPI validation.
+    return ORJSONResponse({"clientToken": token})
 
 
-@app.post("/reserve")
-def reserve(
-    body: TransactionReserveRequest,
+@app.post("/reserve", openapi_extra=msgspec_openapi(TransactionReserveRequest))
+async def reserve(
+    request: Request,
+    body: TransactionReserveRequest = Depends(
+        msgspec_body(TransactionReserveRequest)),
 ):
     """Reserve a one-time transaction in the Telekom checkout API."""
     req_url = "https://pbs.acceptance.p5x.telekom-dienste.de/pbs-checkout-api/direct/reserve"
     headers_dict = {
         "Accept": "*/*",
         "Content-Type": "application/json",
-        "Authorization": f"bearer {MPS_TOKEN}",
+        "Authorization": f"bearer {await get_mps_token(request)}",
     }
 
     payload = {
+        **_PBS_RESERVE_BASE,
         "paymentMethod": "creditcard_braintree",
-        "businessPartnerConfigId": "474",
-        "currency": "EUR",
-        "locale": "de_DE",
-        "description": "Ihr Multibrand Zahlungsmandat",
-        "returnUrl": "http://www.telekom.de",
         "lineItems": [
             {
-                "name": "Zahlung + Speicherung des Zahlungsmandats",
+                **_PBS_LINE_ITEM_BASE,
                 "description": "Initial 15 € + Speicherung des Zahlungsmandats",
                 "grossAmount": body.amount,
-                "taxRate": 19,
-                "quantity": 1,
-                "uiDetails": {},
             }
         ],
         "paymentServiceData": {"nonce": body.payment_method_nonce},
-        "settlementData": {"settlementConfigurationId": "5988"},
     }
-    with httpx.Client(timeout=10.0) as client:
-        data = client.post(req_url, json=payload, headers=headers_dict)
+    data = await _post_with_retry(
+        request,
+        req_url,
+        retry_statuses=_RESERVE_RETRY_STATUSES,
+        content=orjson.dumps(payload),
+        headers=headers_dict,
+    )
 
     print(data.text)
-    return data.text
+    return Response(
+        content=data.content,
+        status_code=data.status_code,
+        media_type="application/json",
+    )
 
 
-@app.post("/onetime/payment/reserve")
-def reserve_onetime(
-    body: TransactionReserveRequest,
+@app.post("/onetime/payment/reserve", openapi_extra=msgspec_openapi(TransactionReserveRequest))
+async def reserve_onetime(
+    request: Request,
+    body: TransactionReserveRequest = Depends(
+        msgspec_body(TransactionReserveRequest)),
 ):
     """Reserve a recurring mandate-based transaction via the checkout API."""
     req_url = "https://pbs.acceptance.p5x.telekom-dienste.de/pbs-checkout-api/recurring/onetime/reserve"
     headers_dict = {
         "Accept": "*/*",
         "Content-Type": "application/json",
-        "Authorization": f"bearer {MPS_TOKEN}",
+        "Authorization": f"bearer {await get_mps_token(request)}",
     }
 
     payload = {
+        **_PBS_RESERVE_BASE,
         "paymentMethod": f"{body.payment_method_token}_braintree",
-        "businessPartnerConfigId": "474",
-        "currency": "EUR",
-        "locale": "de_DE",
-        "description": "Ihr Multibrand Zahlungsmandat",
         "returnUrl": "https://www.dom.de",
         "lineItems": [
             {
-                "name": "Zahlung + Speicherung des Zahlungsmandats",
+                **_PBS_LINE_ITEM_BASE,
                 "description": f"Einmal Zahlung {body.amount} €.",
                 "grossAmount": body.amount,
-                "taxRate": 19,
-                "quantity": 1,
-                "uiDetails": {},
             }
         ],
         "paymentServiceData": {"nonce": body.payment_method_nonce},
-        "settlementData": {"settlementConfigurationId": "5988"},
     }
-    with httpx.Client(timeout=10.0) as client:
-        data = client.post(req_url, json=payload, headers=headers_dict)
+    data = await _post_with_retry(
+        request,
+        req_url,
+        retry_statuses=_RESERVE_RETRY_STATUSES,
+        content=orjson.dumps(payload),
+        headers=headers_dict,
+    )
 
     print(data.text)
-    return data.text
+    return Response(
+        content=data.content,
+        status_code=data.status_code,
+        media_type="application/json",
+    )
 
 
-@app.post("/recurring/payment/reserve")
-def reserve_recurring(
-    body: TransactionReserveRequest,
+@app.post("/recurring/payment/reserve", openapi_extra=msgspec_openapi(TransactionReserveRequest))
+async def reserve_recurring(
+    request: Request,
+    body: TransactionReserveRequest = Depends(
+        msgspec_body(TransactionReserveRequest)),
 ):
     """Reserve a recurring mandate-based transaction via the checkout API."""
     req_url = "https://pbs.acceptance.p5x.telekom-dienste.de/pbs-checkout-api/recurring/payment/direct/reserve"
     headers_dict = {
         "Accept": "*/*",
         "Content-Type": "application/json",
-        "Authorization": f"bearer {MPS_TOKEN}",
+        "Authorization": f"bearer {await get_mps_token(request)}",
     }
 
     payload = {
+        **_PBS_RESERVE_BASE,
         "paymentMethod": f"{body.payment_method_token}_braintree",
-        "businessPartnerConfigId": "474",
-        "currency": "EUR",
-        "locale": "de_DE",
-        "description": "Ihr Multibrand Zahlungsmandat",
-        "returnUrl": "http://www.telekom.de",
         "lineItems": [
             {
-                "name": "Zahlung + Speicherung des Zahlungsmandats",
+                **_PBS_LINE_ITEM_BASE,
                 "description": f"Initial {body.amount} € + Speicherung des Zahlungsmandats",
                 "grossAmount": body.amount,
-                "taxRate": 19,
-                "quantity": 1,
-                "uiDetails": {},
             }
         ],
         "paymentServiceData": {"nonce": body.payment_method_nonce},
-        "settlementData": {"settlementConfigurationId": "5988"},
     }
-    with httpx.Client(timeout=10.0) as client:
-        data = client.post(req_url, json=payload, headers=headers_dict)
+    data = await _post_with_retry(
+        request,
+        req_url,
+        retry_statuses=_RESERVE_RETRY_STATUSES,
+        content=orjson.dumps(payload),
+        headers=headers_dict,
+    )
 
     print(data.text)
-    return data.text
+    return Response(
+        content=data.content,
+        status_code=data.status_code,
+        media_type="application/json",
+    )
 
 
-@app.post("/recurring/paypal")
-def recurring_paypal(
-    body: TransactionReserveRequest,
+@app.post("/recurring/paypal", openapi_extra=msgspec_openapi(TransactionReserveRequest))
+async def recurring_paypal(
+    request: Request,
+    body: TransactionReserveRequest = Depends(
+        msgspec_body(TransactionReserveRequest)),
 ):
     """Create a recurring PayPal checkout session in the Telekom API."""
     req_url = "https://pbs.acceptance.p5x.telekom-dienste.de/pbs-checkout-api/recurring/payment"
     headers_dict = {
         "Accept": "*/*",
         "Content-Type": "application/json",
-        "Authorization": f"bearer {MPS_TOKEN}",
+        "Authorization": f"bearer {await get_mps_token(request)}",
     }
 
     payload = {
+        **_PBS_RESERVE_BASE,
         "paymentMethod": "paypal_braintree",
-        "businessPartnerConfigId": "474",
-        "currency": "EUR",
-        "locale": "de_DE",
-        "description": "Ihr Multibrand Zahlungsmandat",
-        "returnUrl": "http://www.telekom.de",
         "lineItems": [
             {
-                "name": "Zahlung + Speicherung des Zahlungsmandats",
+                **_PBS_LINE_ITEM_BASE,
                 "description": f"Initial {body.amount} € + Speicherung des Zahlungsmandats",
                 "grossAmount": body.amount,
-                "taxRate": 19,
-                "quantity": 1,
-                "uiDetails": {},
             }
         ],
-        "settlementData": {"settlementConfigurationId": "5988"},
     }
-    with httpx.Client(timeout=10.0) as client:
-        data = client.post(req_url, json=payload, headers=headers_dict)
+    data = await _post_with_retry(
+        request,
+        req_url,
+        retry_statuses=_RESERVE_RETRY_STATUSES,
+        content=orjson.dumps(payload),
+        headers=headers_dict,
+    )
 
     print(data.text)
-    return data.json()
+    return Response(
+        content=data.content,
+        status_code=data.status_code,
+        media_type="application/json",
+    )
+
+
+app.mount("/html", StaticFiles(directory=_HTML_DIR, html=True), name="html")
+
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "src.app:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=cpu_count(),
+    )